@@ -1,21 +1,53 @@
 # interactive_kline.py
+import functools
+import hashlib
+import json
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 import tkinter as tk
 from tkinter import ttk, messagebox
 import requests
+from requests.adapters import HTTPAdapter, Retry
+import numpy as np
 import pandas as pd
+import matplotlib
+# 显式选用 Agg 系的 Tk 后端并精简渲染配置。必须在 pyplot 被导入前设置，
+# 而 mplfinance 内部会导入 pyplot，所以这段要放在 import mplfinance 之前
+matplotlib.use('TkAgg')
+matplotlib.rcParams['toolbar'] = 'None'  # 应用不提供导航工具栏，省去其构建开销
+matplotlib.rcParams['path.simplify'] = True
+matplotlib.rcParams['path.simplify_threshold'] = 1.0
+matplotlib.rcParams['agg.path.chunksize'] = 10000
 import mplfinance as mpf
 import re
-import matplotlib
 import matplotlib.pyplot as plt
 from matplotlib import font_manager
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import os
 import platform
 
+try:
+    import orjson  # 比标准库 json 快 2-3 倍，未安装时回退 resp.json()
+except ImportError:
+    orjson = None
+
+try:
+    from numba import njit  # 重采样热路径 JIT 加速，未安装时用纯 Python 循环
+except ImportError:
+    njit = None
+
+
+# 字体在运行期间不会变化，发现过程只需执行一次
+_FONT_INITIALIZED = False
+
 
 def setup_chinese_font():
-    """设置中文字体 - 增强版本"""
+    """设置中文字体 - 增强版本（结果缓存，重复调用直接返回）"""
+    global _FONT_INITIALIZED
+    if _FONT_INITIALIZED:
+        return
     try:
         # 根据操作系统选择字体策略
         system = platform.system()
@@ -65,6 +97,13 @@ def setup_chinese_font():
         select_system_font()
 
     matplotlib.rcParams['axes.unicode_minus'] = False
+    _FONT_INITIALIZED = True
+
+
+@functools.lru_cache(maxsize=1)
+def _available_font_names() -> frozenset:
+    """遍历 fontManager.ttflist 开销不小，只做一次"""
+    return frozenset(f.name for f in font_manager.fontManager.ttflist)
 
 
 def select_system_font():
@@ -74,7 +113,7 @@ def select_system_font():
         'STSong', 'AppleGothic', 'Arial Unicode MS', 'DejaVu Sans'
     ]
 
-    available_fonts = set([f.name for f in font_manager.fontManager.ttflist])
+    available_fonts = _available_font_names()
 
     selected_font = None
     for font in font_candidates:
@@ -92,8 +131,9 @@ def select_system_font():
         print("警告: 未找到中文字体，中文可能显示为方框")
 
 
+@functools.lru_cache(maxsize=1)
 def get_chinese_font_prop():
-    """获取中文字体属性"""
+    """获取中文字体属性（结果缓存）"""
     current_font = matplotlib.rcParams['font.sans-serif'][0]
     if current_font != 'DejaVu Sans':
         return font_manager.FontProperties(family=current_font)
@@ -106,10 +146,89 @@ setup_chinese_font()
 API_URL = ("http://money.finance.sina.com.cn/quotes_service/api/json_v2.php/"
            "CN_MarketData.getKLineData?symbol={symbol}&scale={scale}&ma=no&datalen={datalen}")
 
+# 复用同一个 Session：保持 TCP keep-alive，省掉每次请求的握手开销
+SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=4, pool_maxsize=8,
+                       max_retries=Retry(total=2, backoff_factor=0.3))
+SESSION.mount("http://", _ADAPTER)
+SESSION.mount("https://", _ADAPTER)
+# 请求 gzip 压缩（240 根 K 线约 30KB -> 6KB），requests 自动解压；
+# UA/Referer 避免新浪对无头客户端拒绝服务
+SESSION.headers.update({
+    'Accept-Encoding': 'gzip, deflate',
+    'User-Agent': 'Mozilla/5.0',
+    'Referer': 'https://finance.sina.com.cn/',
+})
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".kline_cache")
+
+
+def _cache_ttl() -> int:
+    """缓存有效期：交易时段内 5 分钟，收盘后 24 小时。"""
+    now = time.localtime()
+    minutes = now.tm_hour * 60 + now.tm_min
+    # 工作日 9:30-15:00 视为交易时段（不考虑节假日，过期仅多发一次请求）
+    if now.tm_wday < 5 and 9 * 60 + 30 <= minutes <= 15 * 60:
+        return 5 * 60
+    return 24 * 3600
+
+
+class FileCache:
+    """
+    文件缓存：K 线数据存为 Parquet，旁路 .json 记录抓取时间戳。
+    按 (symbol, scale, datalen) 生成 key，避免同参数短时间内重复请求新浪接口。
+    """
+
+    def __init__(self, root_dir: str = CACHE_DIR):
+        self.root_dir = root_dir
+        self._lock = threading.Lock()  # on_fetch 在子线程调用，写入需加锁
+
+    def _paths(self, symbol: str, scale: int, datalen: int) -> tuple[str, str]:
+        key = hashlib.md5(f"{symbol}|{scale}|{datalen}".encode()).hexdigest()
+        base = os.path.join(self.root_dir, symbol)
+        return os.path.join(base, f"{key}.parquet"), os.path.join(base, f"{key}.json")
+
+    def get(self, symbol: str, scale: int, datalen: int) -> pd.DataFrame | None:
+        data_path, meta_path = self._paths(symbol, scale, datalen)
+        if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+            return None
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+            if time.time() - meta.get('fetched_at', 0) > _cache_ttl():
+                return None
+            return pd.read_parquet(data_path)
+        except Exception as e:
+            print("读取缓存失败:", e)
+            return None
+
+    def put(self, symbol: str, scale: int, datalen: int, df: pd.DataFrame):
+        data_path, meta_path = self._paths(symbol, scale, datalen)
+        try:
+            with self._lock:
+                os.makedirs(os.path.dirname(data_path), exist_ok=True)
+                df.to_parquet(data_path)
+                with open(meta_path, 'w', encoding='utf-8') as f:
+                    json.dump({'fetched_at': time.time()}, f)
+        except Exception as e:
+            # 缓存写失败不影响主流程（如缺少 pyarrow / 磁盘只读）
+            print("写入缓存失败:", e)
+
+
+_KLINE_CACHE = FileCache()
+
+
+# 预编译，省掉每次点击时 re 模块的缓存查找
+_STOCK_CODE_RE = re.compile(r"^(?:sh|sz)\d{6}$")
+
+# 交易所板块前缀白名单：沪市 6/5/9 开头，深市 0/3/6 开头。
+# 其他前缀新浪必然 404，本地直接拒绝省一次网络往返
+_VALID_CODE_PREFIXES = {'sh6', 'sh5', 'sh9', 'sz0', 'sz3', 'sz6'}
+
 
 def validate_stock_code(code: str) -> str | None:
     code = code.strip().lower()
-    if re.match(r"^(sh|sz)\d{6}$", code):
+    if _STOCK_CODE_RE.match(code) and code[:3] in _VALID_CODE_PREFIXES:
         return code
     return None
 
@@ -117,50 +236,135 @@ def validate_stock_code(code: str) -> str | None:
 def fetch_daily_kline(symbol: str, datalen: int = 120) -> pd.DataFrame | None:
     """
     从新浪获取日线（scale=240）原始 K 线数据并返回 DataFrame（datetime 索引）。
-    如果获取失败返回 None。
+    如果获取失败返回 None。命中本地文件缓存时直接读 Parquet，不走网络。
     """
+    cached = _KLINE_CACHE.get(symbol, 240, datalen)
+    if cached is not None:
+        return cached
     url = API_URL.format(symbol=symbol, scale=240, datalen=datalen)
     try:
-        resp = requests.get(url, timeout=10)
+        resp = SESSION.get(url, timeout=(3, 7))
         resp.raise_for_status()
-        raw = resp.json()
+        raw = orjson.loads(resp.content) if orjson is not None else resp.json()
         if not raw:
             return None
-        df = pd.DataFrame(raw)
-        # 有些字段可能为字符串，转换数值
-        for col in ('open', 'high', 'low', 'close', 'volume'):
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-            else:
-                df[col] = pd.NA
-        df['datetime'] = pd.to_datetime(df['day'])
-        df.set_index('datetime', inplace=True)
-        # 保留必须列并按时间升序（API 返回最新在后/前不稳定，统一升序）
-        df = df.sort_index()
-        df = df[['open', 'high', 'low', 'close', 'volume']]
+        df = pd.DataFrame.from_records(raw)
+        # 一次 reindex 完成列筛选 + 缺失列 NaN 填充，避免逐列赋值
+        df = df.reindex(columns=['day', 'open', 'high', 'low', 'close', 'volume'])
+        # 字段可能为字符串，一次 astype 完成全部类型转换，避免逐列 to_numeric 多趟遍历。
+        # 价格/成交量用 float32：显示只需 4 位小数，内存减半、绘图光栅化更快；
+        # compute_latest_stats 输出时会再转回 Python float
+        df = df.astype({
+            'day': 'datetime64[ns]', 'open': 'float32', 'high': 'float32',
+            'low': 'float32', 'close': 'float32', 'volume': 'float32',
+        })
+        df.set_index('day', inplace=True)
+        df.index.name = 'datetime'
+        # API 返回最新在后/前不稳定，统一升序；已有序时跳过排序
+        if not df.index.is_monotonic_increasing:
+            df.sort_index(inplace=True)
+        _KLINE_CACHE.put(symbol, 240, datalen, df)
         return df
     except Exception as e:
         print("请求失败:", e)
         return None
 
 
+def _ohlc_bucket(ids, o, h, l, c, v):
+    """
+    单趟循环按桶 id 聚合 OHLCV。ids 单调（数据已按时间升序），
+    每次 id 变化开新桶。返回每桶最后一行的下标及五个聚合数组。
+    """
+    n = ids.shape[0]
+    ends = np.empty(n, dtype=np.int64)
+    oo = np.empty(n, dtype=np.float64)
+    hh = np.empty(n, dtype=np.float64)
+    ll = np.empty(n, dtype=np.float64)
+    cc = np.empty(n, dtype=np.float64)
+    vv = np.empty(n, dtype=np.float64)
+    m = -1
+    cur = np.int64(-1)
+    for i in range(n):
+        if ids[i] != cur:
+            m += 1
+            cur = ids[i]
+            oo[m] = o[i]
+            hh[m] = h[i]
+            ll[m] = l[i]
+            vv[m] = 0.0
+        if h[i] > hh[m]:
+            hh[m] = h[i]
+        if l[i] < ll[m]:
+            ll[m] = l[i]
+        cc[m] = c[i]
+        vv[m] += v[i]
+        ends[m] = i
+    m += 1
+    return ends[:m], oo[:m], hh[:m], ll[:m], cc[:m], vv[:m]
+
+
+if njit is not None:
+    _ohlc_bucket = njit(cache=True)(_ohlc_bucket)
+
+
+# 均线窗口与颜色（与 mav=(5, 10, 20) 等价）
+MAV_WINDOWS = (5, 10, 20)
+MAV_COLORS = ('blue', 'orange', 'purple')
+
+
+def _sma(x, w):
+    """滑动求和 O(n) 计算简单移动平均，前 w-1 个位置为 NaN"""
+    n = x.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    s = 0.0
+    for i in range(n):
+        s += x[i]
+        if i >= w:
+            s -= x[i - w]
+        out[i] = s / w if i >= w - 1 else np.nan
+    return out
+
+
+if njit is not None:
+    _sma = njit(cache=True)(_sma)
+
+
+def compute_smas(df: pd.DataFrame) -> dict:
+    """对收盘价预计算 MAV_WINDOWS 各均线，供 addplot 叠加使用"""
+    closes = df['close'].to_numpy(np.float64)
+    return {w: _sma(closes, w) for w in MAV_WINDOWS}
+
+
 def resample_ohlc(df_daily: pd.DataFrame, period: str) -> pd.DataFrame:
     """
-    使用 pandas 对日线重采样为 weekly/monthly。
+    对日线重采样为 weekly/monthly：numpy 算桶 id，单趟循环聚合
+    （有 numba 时 JIT），比 pandas 逐列 resample().agg 快。
     period: 'D' (daily - 返回原始), 'W' 或 'M'
+    period 为 'D' 时直接返回原 DataFrame（调用方约定只读，不做防御性拷贝）。
     """
     if period == 'D':
-        return df_daily.copy()
+        return df_daily
     elif period in ('W', 'M'):
-        ohlc = df_daily[['open', 'high', 'low', 'close']].resample(period).agg({
-            'open': 'first',
-            'high': 'max',
-            'low': 'min',
-            'close': 'last'
-        }).dropna()
-        volume = df_daily['volume'].resample(period).sum().reindex(ohlc.index)
-        ohlc['volume'] = volume
-        return ohlc
+        idx = df_daily.index
+        if period == 'W':
+            iso = idx.isocalendar()
+            bucket_ids = ((iso.year.astype('int64').to_numpy() << 6)
+                          | iso.week.astype('int64').to_numpy())
+        else:
+            bucket_ids = idx.year.to_numpy().astype(np.int64) * 12 + idx.month.to_numpy()
+        ends, o, h, l, c, v = _ohlc_bucket(
+            bucket_ids,
+            df_daily['open'].to_numpy(np.float64),
+            df_daily['high'].to_numpy(np.float64),
+            df_daily['low'].to_numpy(np.float64),
+            df_daily['close'].to_numpy(np.float64),
+            df_daily['volume'].to_numpy(np.float64),
+        )
+        # 标签对齐到周期末，与 pandas resample 的行为一致
+        labels = idx[ends].to_period(period).to_timestamp(how='end').normalize()
+        labels.name = idx.name
+        return pd.DataFrame(
+            {'open': o, 'high': h, 'low': l, 'close': c, 'volume': v}, index=labels)
     else:
         raise ValueError("unsupported period")
 
@@ -172,26 +376,51 @@ def compute_latest_stats(df: pd.DataFrame):
     """
     if df.shape[0] < 2:
         return None
-    last = df.iloc[-1]
-    prev = df.iloc[-2]
-    close_diff = float(last['close'] - prev['close'])
-    change_pct = (close_diff / float(prev['close'])) * 100 if prev['close'] != 0 else 0.0
+    # 直接取底层 ndarray 标量，避免 iloc 构造 Series 的开销
+    closes = df['close'].to_numpy()
+    last_close = float(closes[-1])
+    prev_close = float(closes[-2])
+    close_diff = last_close - prev_close
+    change_pct = (close_diff / prev_close) * 100 if prev_close != 0 else 0.0
     # 这里涨速以小时为单位近似：若原始为日线，则间隔天数
-    time_diff_days = (df.index[-1] - df.index[-2]).total_seconds() / (3600 * 24)
+    index_values = df.index.values
+    time_diff_days = (index_values[-1] - index_values[-2]) / np.timedelta64(1, 'D')
     change_speed = change_pct / (time_diff_days * 24) if time_diff_days > 0 else 0.0
     return {
         '日期': df.index[-1],
-        '开盘价': float(last['open']),
-        '最高价': float(last['high']),
-        '最低价': float(last['low']),
-        '收盘价': float(last['close']),
-        '成交量': float(last['volume']),
+        '开盘价': float(df['open'].to_numpy()[-1]),
+        '最高价': float(df['high'].to_numpy()[-1]),
+        '最低价': float(df['low'].to_numpy()[-1]),
+        '收盘价': last_close,
+        '成交量': float(df['volume'].to_numpy()[-1]),
         '涨跌额': close_diff,
         '涨跌幅': change_pct,
         '涨速': change_speed
     }
 
 
+@dataclass
+class FetchResult:
+    """后台抓取线程交回主线程的一次性结果"""
+    symbol: str
+    df: pd.DataFrame | None = None
+    info: str | None = None
+    error: str | None = None
+
+
+# 通达信配色：红涨绿跌。样式对象构建一次，全局复用
+MARKET_STYLE = mpf.make_mpf_style(
+    base_mpl_style="classic",
+    marketcolors=mpf.make_marketcolors(
+        up='red',
+        down='green',
+        edge='black',
+        wick='black',
+        volume='in'
+    )
+)
+
+
 class KlineApp:
     def __init__(self, root):
         self.root = root
@@ -210,8 +439,9 @@ class KlineApp:
         self.fetch_btn = ttk.Button(top_frame, text="获取并绘图", command=self.on_fetch)
         self.fetch_btn.pack(side=tk.LEFT, padx=6)
 
-        # 图表类型单选
+        # 图表类型单选：切换周期时直接用缓存重绘，不重新请求
         self.period_var = tk.StringVar(value='D')
+        self.period_var.trace_add('write', self._on_period_change)
         ttk.Radiobutton(top_frame, text="日K", variable=self.period_var, value='D').pack(side=tk.LEFT, padx=6)
         ttk.Radiobutton(top_frame, text="周K", variable=self.period_var, value='W').pack(side=tk.LEFT, padx=6)
         ttk.Radiobutton(top_frame, text="月K", variable=self.period_var, value='M').pack(side=tk.LEFT, padx=6)
@@ -230,19 +460,45 @@ class KlineApp:
         # 绘图区
         self.plot_frame = ttk.Frame(root)
         self.plot_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True, padx=8, pady=8)
-        self.canvas_widget = None  # FigureCanvasTkAgg 对象
+
+        # 持久化 Figure / 坐标轴 / 画布：重绘时只清空坐标轴内容，
+        # 不再销毁重建 Tk 控件和 Agg 缓冲区
+        self.fig = mpf.figure(style=MARKET_STYLE, figsize=(12, 6))
+        self.ax_price = self.fig.add_subplot(4, 1, (1, 3))
+        self.ax_volume = self.fig.add_subplot(4, 1, 4, sharex=self.ax_price)
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self.plot_frame)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
         # 存数据
         self.current_df = None
         self.current_symbol = None
+        # 三种周期的数据缓存；周/月重采样在拿到日线后并发预算好
+        self._period_cache = {}
+        self._sma_cache = {}
+        self._executor = ThreadPoolExecutor(max_workers=2)
+
+        # 后台预热 numba JIT：首次点击前编译已完成，用户感知不到编译延迟
+        if njit is not None:
+            threading.Thread(target=self._warmup_jit, daemon=True).start()
+
+    @staticmethod
+    def _warmup_jit():
+        """用哑数据触发 JIT 编译（配合 cache=True，二次启动直接命中磁盘缓存）"""
+        try:
+            dummy = np.arange(10, dtype=np.float64)
+            ids = np.arange(10, dtype=np.int64) // 5
+            _ohlc_bucket(ids, dummy, dummy, dummy, dummy, dummy)
+            _sma(dummy, 5)
+        except Exception as e:
+            print("JIT 预热失败:", e)
 
     def set_status(self, txt: str):
         self.status_label.config(text=f"状态: {txt}")
 
     def show_info(self, text: str):
+        # replace 一次完成 delete+insert，少一次 Tcl 往返
         self.info_text.configure(state='normal')
-        self.info_text.delete('1.0', tk.END)
-        self.info_text.insert(tk.END, text)
+        self.info_text.replace('1.0', tk.END, text)
         self.info_text.configure(state='disabled')
 
     def on_fetch(self):
@@ -258,169 +514,122 @@ class KlineApp:
         thr.start()
 
     def _fetch_and_plot(self, symbol):
+        result = FetchResult(symbol=symbol)
         try:
             df_daily = fetch_daily_kline(symbol, datalen=240)
             if df_daily is None or df_daily.empty:
-                self.root.after(0, lambda: messagebox.showerror("错误", "未能获取到行情数据"))
-                self.root.after(0, lambda: self.set_status("空闲"))
-                self.root.after(0, lambda: self.fetch_btn.config(state=tk.NORMAL))
-                return
-
-            # 根据选择重采样
-            period = self.period_var.get()
-            df = resample_ohlc(df_daily, period)
-            if df is None or df.empty:
-                self.root.after(0, lambda: messagebox.showerror("错误", "重采样后无数据"))
-                return
-
-            # 计算最新行情
-            stats = compute_latest_stats(df)
-            info_lines = [
-                f"股票代码: {symbol.upper()}",
-            ]
-            if stats:
-                info_lines += [
-                    f"日期: {stats['日期']}",
-                    f"开盘价: {stats['开盘价']:.4f}",
-                    f"最高价: {stats['最高价']:.4f}",
-                    f"最低价: {stats['最低价']:.4f}",
-                    f"收盘价: {stats['收盘价']:.4f}",
-                    f"成交量: {stats['成交量']:.4f}",
-                    f"涨跌额: {stats['涨跌额']:.4f}",
-                    f"涨跌幅: {stats['涨跌幅']:.4f}%",
-                    f"涨速: {stats['涨速']:.6f} (%/小时)",
-                ]
+                result.error = "未能获取到行情数据"
             else:
-                info_lines.append("可用数据不足，无法计算最新行情。")
-
-            # 保存数据并在主线程更新 UI 和绘图
-            self.current_df = df
-            self.current_symbol = symbol
-            self.root.after(0, lambda: self.show_info("\n".join(info_lines)))
-            self.root.after(0, lambda: self.set_status("绘制图表中..."))
-            self.root.after(0, lambda: self._draw_mpf(df, symbol))
+                # 并发预算好周/月重采样并全部缓存，切换周期时零网络/零计算
+                fut_w = self._executor.submit(resample_ohlc, df_daily, 'W')
+                fut_m = self._executor.submit(resample_ohlc, df_daily, 'M')
+                self._period_cache = {'D': df_daily, 'W': fut_w.result(), 'M': fut_m.result()}
+                # 各周期均线只算一次，重绘时直接叠加
+                self._sma_cache = {p: compute_smas(d) for p, d in self._period_cache.items()}
+
+                # 根据选择取对应周期
+                df = self._period_cache.get(self.period_var.get())
+                if df is None or df.empty:
+                    result.error = "重采样后无数据"
+                else:
+                    result.df = df
+                    result.info = self._build_info(symbol, df)
         except Exception as e:
             print("后台错误:", e)
-            self.root.after(0, lambda: messagebox.showerror("错误", f"处理失败: {e}"))
-        finally:
-            self.root.after(0, lambda: self.set_status("空闲"))
-            self.root.after(0, lambda: self.fetch_btn.config(state=tk.NORMAL))
+            result.error = f"处理失败: {e}"
+        # 只调度一次主线程回调，避免多个 after + lambda 闭包的 Tcl 事件开销
+        self.root.after(0, self._apply_result, result)
+
+    def _apply_result(self, result: FetchResult):
+        """主线程一次性应用抓取结果：信息、绘图、状态、按钮"""
+        if result.error:
+            messagebox.showerror("错误", result.error)
+        else:
+            self.current_df = result.df
+            self.current_symbol = result.symbol
+            self.show_info(result.info)
+            self.set_status("绘制图表中...")
+            self._draw_mpf(result.df, result.symbol)
+        self.set_status("空闲")
+        self.fetch_btn.config(state=tk.NORMAL)
+
+    def _build_info(self, symbol: str, df: pd.DataFrame) -> str:
+        """生成最新行情文本"""
+        stats = compute_latest_stats(df)
+        info_lines = [
+            f"股票代码: {symbol.upper()}",
+        ]
+        if stats:
+            info_lines += [
+                f"日期: {stats['日期']}",
+                f"开盘价: {stats['开盘价']:.4f}",
+                f"最高价: {stats['最高价']:.4f}",
+                f"最低价: {stats['最低价']:.4f}",
+                f"收盘价: {stats['收盘价']:.4f}",
+                f"成交量: {stats['成交量']:.4f}",
+                f"涨跌额: {stats['涨跌额']:.4f}",
+                f"涨跌幅: {stats['涨跌幅']:.4f}%",
+                f"涨速: {stats['涨速']:.6f} (%/小时)",
+            ]
+        else:
+            info_lines.append("可用数据不足，无法计算最新行情。")
+        return "\n".join(info_lines)
 
-    def _draw_mpf(self, df: pd.DataFrame, symbol: str):
-        # 在绘图前重新确保字体设置
-        setup_chinese_font()
+    def _on_period_change(self, *_):
+        """周期单选切换：直接用缓存数据重绘，不走网络和重采样"""
+        if self.current_symbol is None:
+            return
+        df = self._period_cache.get(self.period_var.get())
+        if df is None or df.empty:
+            return
+        self.current_df = df
+        self.show_info(self._build_info(self.current_symbol, df))
+        self._draw_mpf(df, self.current_symbol)
 
-        # 获取中文字体属性
+    def _draw_mpf(self, df: pd.DataFrame, symbol: str):
+        # 获取中文字体属性（字体设置已在模块导入时完成，无需重复）
         chinese_font_prop = get_chinese_font_prop()
 
-        # 通达信配色：红涨绿跌
-        market_style = mpf.make_mpf_style(
-            base_mpl_style="classic",
-            marketcolors=mpf.make_marketcolors(
-                up='red',
-                down='green',
-                edge='black',
-                wick='black',
-                volume='in'
-            )
-        )
-
-        # 清除旧画布
-        for child in self.plot_frame.winfo_children():
-            child.destroy()
-
-        # 使用 mplfinance 返回 Figure 并嵌入到 Tkinter
+        # 复用持久化坐标轴：只清空内容再重画，外部坐标轴模式下
+        # 样式已在创建 Figure 时固定
+        self.ax_price.clear()
+        self.ax_volume.clear()
+        # 均线用预计算好的数组叠加（mav 参数会让 mplfinance 每次重新 rolling）
+        smas = self._sma_cache.get(self.period_var.get())
+        if smas is None:
+            smas = compute_smas(df)
+        addplots = [
+            mpf.make_addplot(smas[w], ax=self.ax_price, color=color, width=0.8)
+            for w, color in zip(MAV_WINDOWS, MAV_COLORS)
+        ]
         try:
-            # 创建自定义样式，强制设置字体
-            if chinese_font_prop:
-                # 手动创建图形并设置字体
-                fig, axlist = mpf.plot(
-                    df,
-                    type='candle',
-                    mav=(5, 10, 20),
-                    volume=True,
-                    style=market_style,
-                    title=f"{symbol.upper()} 真实K线图（通达信风格）",
-                    ylabel="价格",
-                    ylabel_lower="成交量",
-                    figratio=(12, 6),
-                    figscale=1.2,
-                    returnfig=True,
-                    update_width_config=dict(
-                        candle_linewidth=1.0,
-                        candle_width=0.8,
-                    )
-                )
-
-                # 手动设置所有文本的字体
-                self._set_figure_fonts(fig, chinese_font_prop)
-
-            else:
-                # 如果没有中文字体，使用原始方式
-                fig, axlist = mpf.plot(
-                    df,
-                    type='candle',
-                    mav=(5, 10, 20),
-                    volume=True,
-                    style=market_style,
-                    title=f"{symbol.upper()} K Line Chart",
-                    ylabel="Price",
-                    ylabel_lower="Volume",
-                    figratio=(12, 6),
-                    figscale=1.2,
-                    returnfig=True
+            mpf.plot(
+                df,
+                type='candle',
+                addplot=addplots,
+                ax=self.ax_price,
+                volume=self.ax_volume,
+                update_width_config=dict(
+                    candle_linewidth=1.0,
+                    candle_width=0.8,
                 )
-
+            )
         except Exception as e:
             messagebox.showerror("绘图错误", f"绘图失败: {e}")
             return
 
-        canvas = FigureCanvasTkAgg(fig, master=self.plot_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        self.canvas_widget = canvas
-
-    def _set_figure_fonts(self, fig, font_prop):
-        """手动设置图形中所有文本的字体"""
-        try:
-            # 设置标题字体
-            if hasattr(fig, '_suptitle') and fig._suptitle is not None:
-                fig._suptitle.set_fontproperties(font_prop)
-
-            # 遍历所有轴
-            for ax in fig.get_axes():
-                # 设置轴标题
-                title = ax.get_title()
-                if title:
-                    ax.set_title(title, fontproperties=font_prop)
-
-                # 设置轴标签
-                xlabel = ax.get_xlabel()
-                if xlabel:
-                    ax.set_xlabel(xlabel, fontproperties=font_prop)
-
-                ylabel = ax.get_ylabel()
-                if ylabel:
-                    ax.set_ylabel(ylabel, fontproperties=font_prop)
-
-                # 设置刻度标签
-                for label in ax.get_xticklabels():
-                    label.set_fontproperties(font_prop)
-
-                for label in ax.get_yticklabels():
-                    label.set_fontproperties(font_prop)
-
-                # 设置图例（如果有）
-                legend = ax.get_legend()
-                if legend:
-                    for text in legend.get_texts():
-                        text.set_fontproperties(font_prop)
-
-            # 强制刷新图形
-            fig.canvas.draw_idle()
-
-        except Exception as e:
-            print(f"设置字体时出错: {e}")
+        if chinese_font_prop:
+            self.fig.suptitle(f"{symbol.upper()} 真实K线图（通达信风格）",
+                              fontproperties=chinese_font_prop)
+            self.ax_price.set_ylabel("价格", fontproperties=chinese_font_prop)
+            self.ax_volume.set_ylabel("成交量", fontproperties=chinese_font_prop)
+        else:
+            # 如果没有中文字体，使用英文标签
+            self.fig.suptitle(f"{symbol.upper()} K Line Chart")
+            self.ax_price.set_ylabel("Price")
+            self.ax_volume.set_ylabel("Volume")
+
+        self.canvas.draw_idle()
 
 
 def main():